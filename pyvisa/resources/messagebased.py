@@ -551,7 +551,8 @@ class MessageBasedResource(Resource):
             Are the data in big or little endian order. Defaults to False.
         container : Union[Type, Callable[[Iterable], Sequence]], optional
             Container type to use for the output data. Possible values are: list,
-            tuple, np.ndarray, etc, Default to list.
+            tuple, np.ndarray, array.array, etc, Default to list. array.array
+            returns the values without converting them to Python objects.
         header_fmt : util.BINARY_HEADERS, optional
             Format of the header prefixing the data. Defaults to 'ieee'.
         expect_termination : bool, optional
@@ -713,7 +714,8 @@ class MessageBasedResource(Resource):
             Are the data in big or little endian order. Defaults to False.
         container : Union[Type, Callable[[Iterable], Sequence]], optional
             Container type to use for the output data. Possible values are: list,
-            tuple, np.ndarray, etc, Default to list.
+            tuple, np.ndarray, array.array, etc, Default to list. array.array
+            returns the values without converting them to Python objects.
         delay : Optional[float], optional
             Delay in seconds between write and read operations. If None,
             defaults to self.query_delay.
@@ -31,6 +31,12 @@ try:
 except ImportError:
     np = None
 
+#: Block styles along the functions used to write and read them.
+_BLOCK_STYLES = (
+    ("ieee", util.to_ieee_block, util.from_ieee_block),
+    ("hp", util.to_hp_block, util.from_hp_block),
+)
+
 
 class TestConfigFile(BaseTestCase):
     """Test reading information from a user configuration file."""
@@ -71,6 +77,18 @@ class TestConfigFile(BaseTestCase):
             config.write(f)
         assert util.read_user_library_path() == "test"
 
+    def test_reading_modified_config_file(self):
+        config = ConfigParser()
+        config["Paths"] = {}
+        for value in ("test", "modified test"):
+            config["Paths"]["visa library"] = value
+            with open(self.config_path, "w") as f:
+                config.write(f)
+            assert util.read_user_library_path() == value
+
+        os.remove(self.config_path)
+        assert util.read_user_library_path() is None
+
     def test_no_section(self, caplog):
         config = ConfigParser()
         with open(self.config_path, "w") as f:
@@ -197,6 +215,14 @@ class TestParser(BaseTestCase):
         for a, b in zip(p, e):
             assert a == pytest.approx(b)
 
+        # Test handling mutable and zero-copy blocks
+        for wrapper in (bytearray, memoryview):
+            p = util.from_ieee_block(
+                wrapper(b"#214" + s[2:]), datatype="f", is_big_endian=False
+            )
+            for a, b in zip(p, e):
+                assert a == pytest.approx(b)
+
         # Test handling zero length block
         p = util.from_ieee_block(b"#10" + s[2:], datatype="f", is_big_endian=False)
         assert not p
@@ -220,8 +246,8 @@ class TestParser(BaseTestCase):
             def tb(values):
                 return util.to_ascii_block(values, fmt, ",") + ","
 
-            def fb(block, cont):
-                return util.from_ascii_block(block, fmt, ",", cont)
+            def fb(block, container):
+                return util.from_ascii_block(block, fmt, ",", container)
 
             self.round_trip_block_conversion(values, tb, fb, msg)
 
@@ -235,11 +261,16 @@ class TestParser(BaseTestCase):
             def tb(values):
                 return util.to_ascii_block(values, fmt, ",")
 
-            def fb(block, cont):
-                return util.from_ascii_block(block, fmt, ",", cont)
+            def fb(block, container):
+                return util.from_ascii_block(block, fmt, ",", container)
 
             self.round_trip_block_conversion(values, tb, fb, msg)
 
+    def test_ascii_block_percent_separator(self):
+        assert util.to_ascii_block([1, 2, 3], "d", "%") == "1%2%3"
+        assert util.to_ascii_block(iter([1.5, 2.5]), "g", "%%") == "1.5%%2.5"
+        assert util.to_ascii_block([], "d", ",") == ""
+
     def test_invalid_string_converter(self):
         with pytest.raises(ValueError) as ex:
             util.to_ascii_block([1, 2], "m")
@@ -256,8 +287,8 @@ class TestParser(BaseTestCase):
         def tb(values):
             return util.to_ascii_block(values, fmt, ":".join)
 
-        def fb(block, cont):
-            return util.from_ascii_block(block, fmt, lambda s: s.split(":"), cont)
+        def fb(block, container):
+            return util.from_ascii_block(block, fmt, lambda s: s.split(":"), container)
 
         self.round_trip_block_conversion(values, tb, fb, msg)
 
@@ -268,85 +299,96 @@ class TestParser(BaseTestCase):
         def tb(values):
             return util.to_ascii_block(values, str, ":".join)
 
-        def fb(block, cont):
-            return util.from_ascii_block(block, int, lambda s: s.split(":"), cont)
+        def fb(block, container):
+            return util.from_ascii_block(block, int, lambda s: s.split(":"), container)
 
         self.round_trip_block_conversion(values, tb, fb, msg)
 
-    def test_integer_binary_block(self):
+    @pytest.mark.parametrize("block, tb, fb", _BLOCK_STYLES)
+    @pytest.mark.parametrize("fmt", "bBhHiIfd")
+    @pytest.mark.parametrize("endi", (True, False))
+    def test_integer_binary_block(self, block, tb, fb, fmt, endi):
         values = list(range(99))
-        for block, tb, fb in zip(
-            ("ieee", "hp"),
-            (util.to_ieee_block, util.to_hp_block),
-            (util.from_ieee_block, util.from_hp_block),
-        ):
-            for fmt in "bBhHiIfd":
-                for endi in (True, False):
-                    msg = "block=%s, fmt=%s, endianness=%s"
-                    msg = msg % (block, fmt, endi)
-
-                    def tblock(values):
-                        return tb(values, fmt, endi)
+        msg = "block=%s, fmt=%s, endianness=%s"
+        msg = msg % (block, fmt, endi)
 
-                    def fblock(block, cont):
-                        return fb(block, fmt, endi, cont)
+        tblock = partial(tb, datatype=fmt, is_big_endian=endi)
+        fblock = partial(fb, datatype=fmt, is_big_endian=endi)
+        self.round_trip_block_conversion(values, tblock, fblock, msg)
 
-                    self.round_trip_block_conversion(values, tblock, fblock, msg)
-
-    def test_noninteger_binary_block(self):
+    @pytest.mark.parametrize("block, tb, fb", _BLOCK_STYLES)
+    @pytest.mark.parametrize("fmt", "fd")
+    @pytest.mark.parametrize("endi", (True, False))
+    def test_noninteger_binary_block(self, block, tb, fb, fmt, endi):
         values = [val + 0.5 for val in range(99)]
-        for block, tb, fb in zip(
-            ("ieee", "hp"),
-            (util.to_ieee_block, util.to_hp_block),
-            (util.from_ieee_block, util.from_hp_block),
-        ):
-            for fmt in "fd":
-                for endi in (True, False):
-                    msg = "block=%s, fmt=%s, endianness=%s"
-                    msg = msg % (block, fmt, endi)
-
-                    def tblock(values):
-                        return bytearray(tb(values, fmt, endi))
+        msg = "block=%s, fmt=%s, endianness=%s"
+        msg = msg % (block, fmt, endi)
 
-                    def fblock(block, cont):
-                        return fb(block, fmt, endi, cont)
+        def tblock(values):
+            return memoryview(tb(values, fmt, endi))
 
-                    self.round_trip_block_conversion(values, tblock, fblock, msg)
+        fblock = partial(fb, datatype=fmt, is_big_endian=endi)
+        self.round_trip_block_conversion(values, tblock, fblock, msg)
 
     def test_bytes_binary_block(self):
         values = b"dbslbw cj saj \x00\x76"
-        for block, tb, fb in zip(
-            ("ieee", "hp"),
-            (util.to_ieee_block, util.to_hp_block),
-            (util.from_ieee_block, util.from_hp_block),
-        ):
+        for block, tb, fb in _BLOCK_STYLES:
             for fmt in "sbB":
                 block = tb(values, datatype=fmt)
                 print(fmt, block)
                 rt = fb(block, datatype=fmt, container=bytes)
                 assert values == rt
 
+    def test_bytes_input_with_numeric_datatype(self):
+        with pytest.warns(UserWarning):
+            block = util.to_ieee_block(b"ab", "h", True)
+        assert block == b"#14\x00\x61\x00\x62"
+
+        with pytest.warns(UserWarning):
+            block = util.to_hp_block(bytearray(b"a"), "f", False)
+        assert block == b"#A\x04\x00" + struct.pack("<f", 0x61)
+
+    @pytest.mark.parametrize(
+        "fmt, values, payload",
+        [
+            ("h", [1, -2], b"\x00\x01\xff\xfe"),
+            ("I", [1, 0x01020304], b"\x00\x00\x00\x01\x01\x02\x03\x04"),
+            ("f", [1.0, -2.5], b"\x3f\x80\x00\x00\xc0\x20\x00\x00"),
+            ("d", [1.0], b"\x3f\xf0\x00\x00\x00\x00\x00\x00"),
+        ],
+    )
+    def test_big_endian_binary_block(self, fmt, values, payload):
+        header = b"#1%d" % len(payload)
+        assert util.to_ieee_block(values, fmt, True) == header + payload
+        for cont in (list, tuple):
+            assert util.from_ieee_block(header + payload, fmt, True, cont) == cont(
+                values
+            )
+
+        little_endian = util.to_ieee_block(values, fmt, False)
+        assert little_endian != header + payload
+        assert util.from_ieee_block(little_endian, fmt, False) == values
+
     def test_malformed_binary_block_header(self):
         values = list(range(10))
-        for header, tb, fb in zip(
-            ("ieee", "hp"),
-            (util.to_ieee_block, util.to_hp_block),
-            (util.from_ieee_block, util.from_hp_block),
-        ):
+        for header, tb, fb in _BLOCK_STYLES:
             block = tb(values, "h", False)
             bad_block = block[1:]
-            with pytest.raises(ValueError) as e:
-                fb(bad_block, "h", False, list)
+            for wrapper in (bytes, memoryview):
+                with pytest.raises(ValueError) as e:
+                    fb(wrapper(bad_block), "h", False, list)
+
+                assert "(#" in e.exconly()
 
-            assert "(#" in e.exconly()
+    def test_truncated_hp_block_header(self):
+        for is_big_endian in (True, False):
+            with pytest.raises(ValueError) as e:
+                util.from_hp_block(b"#A\x01", "h", is_big_endian, list)
+            assert "truncated" in e.exconly()
 
     def test_weird_binary_block_header(self):
         values = list(range(100))
-        for header, tb, fb in zip(
-            ("ieee", "hp"),
-            (util.to_ieee_block, util.to_hp_block),
-            (util.from_ieee_block, util.from_hp_block),
-        ):
+        for header, tb, fb in _BLOCK_STYLES:
             block = tb(values, "h", False)
             bad_block = block[1:]
             if header == "hp":
@@ -357,11 +399,7 @@ class TestParser(BaseTestCase):
 
     def test_weird_binary_block_header_raise(self):
         values = list(range(100))
-        for header, tb, fb in zip(
-            ("ieee", "hp"),
-            (util.to_ieee_block, util.to_hp_block),
-            (util.from_ieee_block, util.from_hp_block),
-        ):
+        for header, tb, fb in _BLOCK_STYLES:
             block = tb(values, "h", False)
             bad_block = block[1:]
             if header == "hp":
@@ -380,11 +418,7 @@ class TestParser(BaseTestCase):
 
     def test_binary_block_shorter_than_advertized(self):
         values = list(range(99))
-        for header, tb, fb in zip(
-            ("ieee", "hp"),
-            (util.to_ieee_block, util.to_hp_block),
-            (util.from_ieee_block, util.from_hp_block),
-        ):
+        for header, tb, fb in _BLOCK_STYLES:
             block = tb(values, "h", False)
             if header == "ieee":
                 header_byte_number = int(block[1])
@@ -402,11 +436,7 @@ class TestParser(BaseTestCase):
 
     def test_guessing_block_length(self):
         values = list(range(99))
-        for header, tb, fb in zip(
-            ("ieee", "hp"),
-            (util.to_ieee_block, util.to_hp_block),
-            (util.from_ieee_block, util.from_hp_block),
-        ):
+        for header, tb, fb in _BLOCK_STYLES:
             block = tb(values, "h", False) + b"\n"
             if header == "ieee":
                 header_length = int(block[1:2].decode())
@@ -415,6 +445,21 @@ class TestParser(BaseTestCase):
                 block = block[:2] + b"\x00\x00\x00\x00" + block[2 + 4 :]
             assert not fb(block, "h", False, list)
 
+    @pytest.mark.parametrize("block, tb, fb", _BLOCK_STYLES)
+    @pytest.mark.parametrize("endi", (True, False))
+    def test_array_container(self, block, tb, fb, endi):
+        values = [val + 0.5 for val in range(99)]
+        data_length = len(values) * struct.calcsize("d")
+        parsed = fb(tb(values, "d", endi), "d", endi, array.array)
+        assert isinstance(parsed, array.array)
+        assert parsed == array.array("d", values)
+        # The array holds the raw values, not one Python object per value
+        assert parsed.buffer_info()[1] * parsed.itemsize == data_length
+
+        with pytest.raises(ValueError) as e:
+            fb(tb(b"abc", "s", endi), "s", endi, array.array)
+        assert "array.array cannot be used" in e.exconly()
+
     def test_handling_malformed_binary(self):
         containers = (list, tuple) + ((np.array, np.ndarray) if np else ())
 
@@ -427,27 +472,28 @@ class TestParser(BaseTestCase):
         for container in containers:
             with pytest.raises(ValueError) as e:
                 util.from_binary_block(DumbBytes(b"\x00\x00\x00"), container=container)
-            assert (
-                "malformed" if container in (list, tuple) else "buffer" in e.exconly()
-            )
+            expected = "malformed" if container in (list, tuple) else "buffer"
+            assert expected in e.exconly()
 
     def round_trip_block_conversion(self, values, to_block, from_block, msg):
         """Test that block conversion round trip as expected."""
         containers = (list, tuple) + ((np.array,) if np else ())
         for cont in containers:
             conv = cont(values)
-            msg += ", container=%s"
-            msg = msg % cont.__name__
+            cont_msg = "%s, container=%s" % (msg, cont.__name__)
             try:
                 block = to_block(conv)
-                parsed = from_block(block, cont)
+                parsed = from_block(block, container=cont)
             except Exception as e:
-                raise Exception(msg + "\n" + repr(e))
+                raise Exception(cont_msg + "\n" + repr(e))
 
             if np and cont in (np.array,):
-                np.testing.assert_array_equal(conv, parsed, msg)
+                np.testing.assert_array_equal(conv, parsed, cont_msg)
             else:
-                assert conv == parsed, msg
+                # All the values used in the tests are exactly representable as
+                # doubles so compare them in bulk rather than element-wise.
+                assert isinstance(parsed, cont), cont_msg
+                assert array.array("d", conv) == array.array("d", parsed), cont_msg
 
 
 class TestSystemDetailsAnalysis(BaseTestCase):
@@ -475,6 +521,42 @@ class TestSystemDetailsAnalysis(BaseTestCase):
         assert not details["backends"]
         assert details["unicode"] == "UCS4"
 
+    def test_system_details_caching(self, monkeypatch):
+        platform_calls = []
+        debug_info_calls = []
+
+        def counting_platform():
+            platform_calls.append(None)
+            return "test platform"
+
+        class CountingBackend:
+            @classmethod
+            def get_debug_info(cls):
+                debug_info_calls.append(None)
+                return ["debug info %d" % len(debug_info_calls)]
+
+        monkeypatch.setattr(util.platform, "platform", counting_platform)
+        monkeypatch.setattr(highlevel, "list_backends", lambda: ["test"])
+        monkeypatch.setattr(highlevel, "get_wrapper_class", lambda b: CountingBackend)
+        util.get_system_details.cache_clear()
+        try:
+            first = util.get_system_details()
+            second = util.get_system_details()
+            # The interpreter details are cached but the backends are queried
+            # every time.
+            assert len(platform_calls) == 1
+            assert len(debug_info_calls) == 2
+            assert first["platform"] == second["platform"] == "test platform"
+            assert first["backends"]["test"] == ["debug info 1"]
+            assert second["backends"]["test"] == ["debug info 2"]
+
+            util.get_system_details.cache_clear()
+            util.get_system_details()
+            assert len(platform_calls) == 2
+            assert len(debug_info_calls) == 3
+        finally:
+            util.get_system_details.cache_clear()
+
     def test_get_debug_info(self):
         details = util.system_details_to_str(util.get_system_details())
         assert util.get_debug_info(False) == details
@@ -614,6 +696,41 @@ class TestLibraryAnalysis(BaseTestCase):
         finally:
             sys.platform = platform
 
+    def test_get_binary_arch(self, tmp_path: Path):
+        """Test identifying the architecture of ELF and Mach-O binaries."""
+        elf_header = b"\x7fELF\x01\x01\x01" + 11 * b"\0"
+        fat_header = b"\xca\xfe\xba\xbe" + struct.pack(">I", 2)
+        headers = {
+            "elf_i386": (
+                elf_header + struct.pack("<H", 0x03),
+                [util.ArchitectureType.I386],
+            ),
+            "elf_x86_64_big_endian": (
+                elf_header[:5] + b"\x02" + elf_header[6:] + struct.pack(">H", 0x3E),
+                [util.ArchitectureType.X86_64],
+            ),
+            "elf_unknown": (elf_header + struct.pack("<H", 0x28), []),
+            "macho_arm64": (
+                b"\xcf\xfa\xed\xfe" + struct.pack("<I", 0x0100000C),
+                [util.ArchitectureType.AARCH64],
+            ),
+            "macho_universal": (
+                fat_header
+                + struct.pack(">5I", 0x0100000C, 0, 0, 0, 0)
+                + struct.pack(">5I", 0x01000007, 0, 0, 0, 0),
+                [util.ArchitectureType.X86_64, util.ArchitectureType.AARCH64],
+            ),
+            # Java class file (minor version 0, major version 52)
+            "java_class": (fat_header[:4] + b"\x00\x00\x00\x34", None),
+            "text": (b"not a binary", None),
+        }
+        for name, (header, archs) in headers.items():
+            path = tmp_path / name
+            path.write_bytes(header)
+            assert util.get_binary_arch(path) == archs, name
+
+        assert util.get_binary_arch(tmp_path / "missing") is None
+
     @pytest.mark.skipif(sys.version_info < (3, 7), reason="Fails weirdly on Python 3.6")
     def test_get_arch_unix(self):
         """Test identifying the computer architecture on linux and Mac."""
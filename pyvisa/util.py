@@ -8,19 +8,23 @@ This file is part of PyVISA.
 
 """
 
+import array
 import functools
 import inspect
 import io
 import math
 import os
 import platform
+import re
 import struct
 import subprocess
 import sys
 import warnings
 from collections import OrderedDict
+from configparser import ConfigParser, NoOptionError, NoSectionError
 from enum import Enum
 from pathlib import Path
+from threading import Lock
 from types import ModuleType
 from typing import (
     Any,
@@ -69,6 +73,60 @@ def _use_numpy_routines(container: Union[type, Callable]) -> bool:
     return False
 
 
+#: Path of the configuration file stored in the user home directory. Resolving
+#: the home directory may require a lookup in the password database so it is
+#: done only once. The sys prefix is not cached since it may be altered at
+#: runtime.
+_USER_CONFIG_PATH = os.path.join(os.path.expanduser("~"), ".pyvisarc")
+
+#: Last parsed user configuration, stored along the path, modification time and
+#: size of the files that were read to build it.
+_config_cache: Optional[
+    Tuple[Tuple[Tuple[str, int, int], ...], List[str], ConfigParser]
+] = None
+
+#: Lock ensuring that concurrent readers parse the configuration files once and
+#: never observe a partially updated cache.
+_config_lock = Lock()
+
+
+def _read_user_config() -> Tuple[List[str], ConfigParser]:
+    """Read the user configuration files.
+
+    The parsed configuration is cached and only read again if the configuration
+    files are created, removed or modified.
+
+    Returns
+    -------
+    List[str]
+        Paths of the configuration files that were successfully read.
+    ConfigParser
+        Parser holding the configuration. It should not be modified.
+
+    """
+    global _config_cache
+
+    stats = []
+    for path in (
+        os.path.join(sys.prefix, "share", "pyvisa", ".pyvisarc"),
+        _USER_CONFIG_PATH,
+    ):
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        stats.append((path, st.st_mtime_ns, st.st_size))
+    key = tuple(stats)
+
+    with _config_lock:
+        if _config_cache is None or _config_cache[0] != key:
+            config_parser = ConfigParser()
+            files = config_parser.read([path for path, _, _ in stats])
+            _config_cache = (key, files, config_parser)
+
+        return _config_cache[1], _config_cache[2]
+
+
 def read_user_library_path() -> Optional[str]:
     """Return the library path stored in one of the following configuration files:
 
@@ -87,15 +145,7 @@ def read_user_library_path() -> Optional[str]:
     Return `None` if  configuration files or keys are not present.
 
     """
-    from configparser import ConfigParser, NoOptionError, NoSectionError
-
-    config_parser = ConfigParser()
-    files = config_parser.read(
-        [
-            os.path.join(sys.prefix, "share", "pyvisa", ".pyvisarc"),
-            os.path.join(os.path.expanduser("~"), ".pyvisarc"),
-        ]
-    )
+    files, config_parser = _read_user_config()
 
     if not files:
         logger.debug("No user defined library files")
@@ -127,17 +177,9 @@ def add_user_dll_extra_paths() -> Optional[List[str]]:
         dll_extra_paths=/my/otherpath/;/my/otherpath2
 
     """
-    from configparser import ConfigParser, NoOptionError, NoSectionError
-
     # os.add_dll_library_path has been added in Python 3.8
     if sys.version_info >= (3, 8) and sys.platform == "win32":
-        config_parser = ConfigParser()
-        files = config_parser.read(
-            [
-                os.path.join(sys.prefix, "share", "pyvisa", ".pyvisarc"),
-                os.path.join(os.path.expanduser("~"), ".pyvisarc"),
-            ]
-        )
+        files, config_parser = _read_user_config()
 
         if not files:
             logger.debug("No user defined configuration")
@@ -197,6 +239,10 @@ class PEMachineType(Enum):
     CEE = 0xC0EE
 
 
+#: Mapping between the machine field of a PE header and the machine type.
+_PE_MACHINE_TYPES: Dict[int, PEMachineType] = {m.value: m for m in PEMachineType}
+
+
 class ArchitectureType(Enum):
     I386 = ("x86", 32)
     X86_64 = ("x86", 64)
@@ -214,6 +260,14 @@ class ArchitectureType(Enum):
         return None
 
 
+#: Architectures that can be identified from the machine type of a PE header.
+_PE_ARCHITECTURES: Dict[PEMachineType, ArchitectureType] = {
+    PEMachineType.I386: ArchitectureType.I386,
+    PEMachineType.AMD64: ArchitectureType.X86_64,
+    PEMachineType.AARCH64: ArchitectureType.AARCH64,
+}
+
+
 class LibraryPath(str):
     """Object encapsulating information about a VISA dynamic library."""
 
@@ -376,6 +430,17 @@ def to_ascii_block(
         If a str is given, separator.join(data) is used.
 
     """
+    if isinstance(converter, str) and isinstance(separator, str):
+        # Build a single format string covering the whole block so that all the
+        # values are formatted in one pass of the % operator instead of one
+        # Python level formatting operation per value.
+        if np is not None and isinstance(iterable, np.ndarray):
+            values = tuple(iterable.tolist())
+        else:
+            values = tuple(iterable)
+        fmt = separator.replace("%", "%%").join(("%" + converter,) * len(values))
+        return fmt % values
+
     if isinstance(separator, str):
         separator = separator.join
 
@@ -383,7 +448,7 @@ def to_ascii_block(
         converter = "%" + converter
         block = separator(converter % val for val in iterable)
     else:
-        block = separator(converter(val) for val in iterable)
+        block = separator(map(converter, iterable))
     return block
 
 
@@ -399,9 +464,19 @@ BINARY_DATATYPES = Literal[
 #: Valid output containers for storing the parsed binary data
 BINARY_CONTAINERS = Union[type, Callable]
 
+#: Binary datatypes for which the array module uses the same item size as the
+#: standard sizes of the struct module and which can hence be unpacked in bulk
+#: using an array.array.
+_ARRAY_DATATYPES = frozenset(
+    c for c in "bBhHiIlLqQfd" if array.array(c).itemsize == struct.calcsize("<" + c)
+)
+
+#: Is the native byte order of the platform big endian.
+_NATIVE_BIG_ENDIAN = sys.byteorder == "big"
+
 
 def parse_ieee_block_header(
-    block: Union[bytes, bytearray],
+    block: Union[bytes, bytearray, memoryview],
     length_before_block: Optional[int] = None,
     raise_on_late_block: bool = False,
 ) -> Tuple[int, int]:
@@ -421,7 +496,7 @@ def parse_ieee_block_header(
 
     Parameters
     ----------
-    block : Union[bytes, bytearray]
+    block : Union[bytes, bytearray, memoryview]
         IEEE formatted block of data.
     length_before_block : Optional[int], optional
         Number of bytes before the actual start of the block. Default to None,
@@ -438,7 +513,17 @@ def parse_ieee_block_header(
         Length of the data in bytes.
 
     """
-    begin = block.find(b"#")
+    try:
+        begin = block.find(b"#")  # type: ignore
+    except AttributeError:
+        if not isinstance(block, memoryview):
+            raise
+        # memoryview has no find method but re can search its buffer without
+        # copying it. Only the bytes up to the end of the header are copied so
+        # that the rest of the parsing operates on bytes.
+        match = re.search(b"#", block)
+        begin = match.start() if match else -1
+        block = bytes(block[: begin + 11 if match else 25])
     if begin < 0:
         raise ValueError(
             "Could not find hash sign (#) indicating the start of the block. "
@@ -458,10 +543,10 @@ def parse_ieee_block_header(
         else:
             warnings.warn(msg, UserWarning)
 
-    try:
-        # int(block[begin+1]) != int(block[begin+1:begin+2]) in Python 3
-        header_length = int(block[begin + 1 : begin + 2])
-    except ValueError:
+    # Indexing bytes gives the ASCII code of the digit, any byte which is not a
+    # digit (or a missing byte) is handled as an indefinite length block.
+    header_length = block[begin + 1] - 0x30 if begin + 1 < len(block) else 0
+    if not 0 <= header_length <= 9:
         header_length = 0
     offset = begin + 2 + header_length
 
@@ -477,8 +562,13 @@ def parse_ieee_block_header(
     return offset, data_length
 
 
+#: Struct used to decode the 2 bytes length field of HP blocks.
+_HP_LENGTH_BIG_ENDIAN = struct.Struct(">H")
+_HP_LENGTH_LITTLE_ENDIAN = struct.Struct("<H")
+
+
 def parse_hp_block_header(
-    block: Union[bytes, bytearray],
+    block: Union[bytes, bytearray, memoryview],
     is_big_endian: bool,
     length_before_block: Optional[int] = None,
     raise_on_late_block: bool = False,
@@ -493,7 +583,7 @@ def parse_hp_block_header(
 
     Parameters
     ----------
-    block : Union[bytes, bytearray]
+    block : Union[bytes, bytearray, memoryview]
         HP formatted block of data.
     is_big_endian : bool
         Is the header in big or little endian order.
@@ -512,7 +602,15 @@ def parse_hp_block_header(
         Length of the data in bytes.
 
     """
-    begin = block.find(b"#A")
+    try:
+        begin = block.find(b"#A")  # type: ignore
+    except AttributeError:
+        if not isinstance(block, memoryview):
+            raise
+        # See parse_ieee_block_header, the header of a HP block is 4 bytes long
+        match = re.search(b"#A", block)
+        begin = match.start() if match else -1
+        block = bytes(block[: begin + 4 if match else 25])
     if begin < 0:
         raise ValueError(
             "Could not find the standard block header (#A) indicating the start "
@@ -534,15 +632,20 @@ def parse_hp_block_header(
 
     offset = begin + 4
 
-    data_length = int.from_bytes(
-        block[begin + 2 : offset], byteorder="big" if is_big_endian else "little"
-    )
+    length_struct = _HP_LENGTH_BIG_ENDIAN if is_big_endian else _HP_LENGTH_LITTLE_ENDIAN
+    try:
+        (data_length,) = length_struct.unpack_from(block, begin + 2)
+    except struct.error:
+        raise ValueError(
+            "The standard block header (#A) is truncated, the block ends by %r"
+            % block[begin:]
+        )
 
     return offset, data_length
 
 
 def from_ieee_block(
-    block: Union[bytes, bytearray],
+    block: Union[bytes, bytearray, memoryview],
     datatype: BINARY_DATATYPES = "f",
     is_big_endian: bool = False,
     container: Callable[
@@ -562,7 +665,7 @@ def from_ieee_block(
 
     Parameters
     ----------
-    block : Union[bytes, bytearray]
+    block : Union[bytes, bytearray, memoryview]
         IEEE formatted block of data.
     datatype : BINARY_DATATYPES, optional
         Format string for a single element. See struct module. 'f' by default.
@@ -570,7 +673,8 @@ def from_ieee_block(
         Are the data in big or little endian order.
     container : Union[Type, Callable[[Iterable], Sequence]], optional
         Container type to use for the output data. Possible values are: list,
-        tuple, np.ndarray, etc, Default to list.
+        tuple, np.ndarray, array.array, etc, Default to list. array.array
+        returns the values without converting them to Python objects.
 
     Returns
     -------
@@ -597,7 +701,7 @@ def from_ieee_block(
 
 
 def from_hp_block(
-    block: Union[bytes, bytearray],
+    block: Union[bytes, bytearray, memoryview],
     datatype: BINARY_DATATYPES = "f",
     is_big_endian: bool = False,
     container: Callable[
@@ -614,7 +718,7 @@ def from_hp_block(
 
     Parameters
     ----------
-    block : Union[bytes, bytearray]
+    block : Union[bytes, bytearray, memoryview]
         HP formatted block of data.
     datatype : BINARY_DATATYPES, optional
         Format string for a single element. See struct module. 'f' by default.
@@ -622,7 +726,8 @@ def from_hp_block(
         Are the data in big or little endian order.
     container : Union[Type, Callable[[Iterable], Sequence]], optional
         Container type to use for the output data. Possible values are: list,
-        tuple, np.ndarray, etc, Default to list.
+        tuple, np.ndarray, array.array, etc, Default to list. array.array
+        returns the values without converting them to Python objects.
 
     Returns
     -------
@@ -644,7 +749,7 @@ def from_hp_block(
 
 
 def from_binary_block(
-    block: Union[bytes, bytearray],
+    block: Union[bytes, bytearray, memoryview],
     offset: int = 0,
     data_length: Optional[int] = None,
     datatype: BINARY_DATATYPES = "f",
@@ -658,7 +763,7 @@ def from_binary_block(
 
     Parameters
     ----------
-    block : Union[bytes, bytearray]
+    block : Union[bytes, bytearray, memoryview]
         HP formatted block of data.
     offset : int
         Offset at which the actual data starts
@@ -670,7 +775,8 @@ def from_binary_block(
         Are the data in big or little endian order.
     container : Union[Type, Callable[[Iterable], Sequence]], optional
         Container type to use for the output data. Possible values are: list,
-        tuple, np.ndarray, etc, Default to list.
+        tuple, np.ndarray, array.array, etc, Default to list. array.array
+        returns the values without converting them to Python objects.
 
     Returns
     -------
@@ -690,6 +796,30 @@ def from_binary_block(
         assert np  # for typing
         return np.frombuffer(block, endianess + datatype, array_length, offset)
 
+    # struct.unpack_from directly produces a tuple which is the cheapest option
+    # for tuple containers, for other containers going through an array and
+    # converting it to a list is faster.
+    if datatype in _ARRAY_DATATYPES and container is not tuple:
+        # Slice a view so that the payload is copied only once, by frombytes
+        payload = memoryview(block)[offset : offset + array_length * element_length]
+        if len(payload) != array_length * element_length:
+            raise ValueError("Binary data was malformed")
+        values = array.array(datatype)
+        values.frombytes(payload)
+        if is_big_endian != _NATIVE_BIG_ENDIAN:
+            values.byteswap()
+        # Returning the array avoids creating one Python object per value
+        if container is array.array:
+            return values
+        if container is list:
+            return values.tolist()
+        return container(values.tolist())
+
+    if container is array.array:
+        raise ValueError(
+            "array.array cannot be used as container for the datatype %r" % datatype
+        )
+
     fullfmt = "%s%d%s" % (endianess, array_length, datatype)
 
     try:
@@ -832,7 +962,54 @@ DebugInfo = Union[List[str], Dict[str, Any]]
 def get_system_details(
     backends: bool = True,
 ) -> Dict[str, Union[str, Dict[str, DebugInfo]]]:
-    """Return a dictionary with information about the system."""
+    """Return a dictionary with information about the system.
+
+    The details about the interpreter and the platform are cached, use
+    `get_system_details.cache_clear()` to force them to be collected again. The
+    backends details reflect the current state of the backends and are always
+    collected.
+
+    """
+    key = (sys.maxunicode, sys.platform, sys.version)
+    backend_details: Dict[str, DebugInfo] = OrderedDict()
+    d: Dict[str, Union[str, dict]] = dict(_get_interpreter_details(key))
+    d["backends"] = backend_details
+
+    if backends:
+        from . import highlevel
+
+        for backend in highlevel.list_backends():
+            if backend.startswith("pyvisa-"):
+                backend = backend[7:]
+
+            try:
+                cls = highlevel.get_wrapper_class(backend)
+            except Exception as e:
+                backend_details[backend] = [
+                    "Could not instantiate backend",
+                    "-> %s" % str(e),
+                ]
+                continue
+
+            try:
+                backend_details[backend] = cls.get_debug_info()
+            except Exception as e:
+                backend_details[backend] = [
+                    "Could not obtain debug info",
+                    "-> %s" % str(e),
+                ]
+
+    return d
+
+
+@functools.lru_cache(maxsize=8)
+def _get_interpreter_details(key: Tuple[Any, ...]) -> Dict[str, str]:
+    """Collect the details about the interpreter and the platform.
+
+    key describes the interpreter and is only used to discriminate the cached
+    results.
+
+    """
     buildno, builddate = platform.python_build()
     if sys.maxunicode == 65535:
         # UCS2 build (standard)
@@ -849,8 +1026,7 @@ def get_system_details(
 
     from . import __version__
 
-    backend_details: Dict[str, DebugInfo] = OrderedDict()
-    d: Dict[str, Union[str, dict]] = {
+    return {
         "platform": platform.platform(),
         "processor": platform.processor(),
         "executable": sys.executable,
@@ -862,34 +1038,10 @@ def get_system_details(
         "unicode": unitype,
         "architecture": architecture_str,
         "pyvisa": __version__,
-        "backends": backend_details,
     }
 
-    if backends:
-        from . import highlevel
-
-        for backend in highlevel.list_backends():
-            if backend.startswith("pyvisa-"):
-                backend = backend[7:]
-
-            try:
-                cls = highlevel.get_wrapper_class(backend)
-            except Exception as e:
-                backend_details[backend] = [
-                    "Could not instantiate backend",
-                    "-> %s" % str(e),
-                ]
-                continue
-
-            try:
-                backend_details[backend] = cls.get_debug_info()
-            except Exception as e:
-                backend_details[backend] = [
-                    "Could not obtain debug info",
-                    "-> %s" % str(e),
-                ]
 
-    return d
+get_system_details.cache_clear = _get_interpreter_details.cache_clear  # type: ignore
 
 
 def system_details_to_str(
@@ -980,10 +1132,11 @@ def get_debug_info(to_screen: bool = True):
 def get_shared_library_arch(filename: Union[str, Path]) -> PEMachineType:
     """Get the architecture of shared library."""
     with io.open(filename, "rb") as fp:
+        # Only the DOS header and the start of the PE header are read, so that
+        # large libraries are never loaded in memory.
         dos_headers = fp.read(64)
-        _ = fp.read(4)
 
-        magic, skip, offset = struct.unpack("=2s58sl", dos_headers)
+        magic, offset = struct.unpack("=2s58xl", dos_headers)
 
         if magic != b"MZ":
             raise Exception("Not an executable")
@@ -991,15 +1144,81 @@ def get_shared_library_arch(filename: Union[str, Path]) -> PEMachineType:
         fp.seek(offset, io.SEEK_SET)
         pe_header = fp.read(6)
 
-        sig, skip, machine = struct.unpack(str("=2s2sH"), pe_header)
+        sig, machine = struct.unpack("=2s2xH", pe_header)
 
         if sig != b"PE":
             raise Exception("Not a PE executable")
 
-        try:
-            return PEMachineType(machine)
-        except ValueError:
-            return PEMachineType.UNKNOWN
+        return _PE_MACHINE_TYPES.get(machine, PEMachineType.UNKNOWN)
+
+
+#: Architectures identified by the machine field (e_machine) of an ELF header.
+_ELF_ARCHITECTURES: Dict[int, ArchitectureType] = {
+    0x03: ArchitectureType.I386,
+    0x3E: ArchitectureType.X86_64,
+    0xB7: ArchitectureType.AARCH64,
+}
+
+#: Architectures identified by the cpu type of a Mach-O header.
+_MACHO_ARCHITECTURES: Dict[int, ArchitectureType] = {
+    0x00000007: ArchitectureType.I386,
+    0x01000007: ArchitectureType.X86_64,
+    0x0100000C: ArchitectureType.AARCH64,
+}
+
+#: Byte order of thin Mach-O headers indexed by their magic number.
+_MACHO_MAGICS = {
+    b"\xfe\xed\xfa\xce": ">",
+    b"\xfe\xed\xfa\xcf": ">",
+    b"\xce\xfa\xed\xfe": "<",
+    b"\xcf\xfa\xed\xfe": "<",
+}
+
+#: Size of the architecture entries of universal Mach-O headers indexed by their
+#: magic number.
+_MACHO_FAT_MAGICS = {b"\xca\xfe\xba\xbe": 20, b"\xca\xfe\xba\xbf": 32}
+
+
+def get_binary_arch(filename: Union[str, Path]) -> Optional[List[ArchitectureType]]:
+    """Get the architectures of an ELF or Mach-O binary by reading its header.
+
+    Returns None if the file cannot be read or is not in one of those formats.
+
+    """
+    try:
+        with io.open(filename, "rb") as fp:
+            header = fp.read(4096)
+    except OSError:
+        return None
+
+    magic = header[:4]
+    if magic == b"\x7fELF" and len(header) >= 20:
+        # The 6th byte of the identification (EI_DATA) is 1 for little endian
+        byteorder = "<" if header[5] == 1 else ">"
+        (machine,) = struct.unpack_from(byteorder + "H", header, 18)
+        cputypes = [machine]
+        known = _ELF_ARCHITECTURES
+    elif magic in _MACHO_MAGICS and len(header) >= 8:
+        (cputype,) = struct.unpack_from(_MACHO_MAGICS[magic] + "I", header, 4)
+        cputypes = [cputype]
+        known = _MACHO_ARCHITECTURES
+    elif magic in _MACHO_FAT_MAGICS and len(header) >= 8:
+        entry_size = _MACHO_FAT_MAGICS[magic]
+        (count,) = struct.unpack_from(">I", header, 4)
+        # Java class files share the magic number of universal binaries but
+        # their version makes for an implausible number of architectures.
+        if count > 32 or 8 + count * entry_size > len(header):
+            return None
+        cputypes = [
+            struct.unpack_from(">I", header, 8 + i * entry_size)[0]
+            for i in range(count)
+        ]
+        known = _MACHO_ARCHITECTURES
+    else:
+        return None
+
+    found = {known[c] for c in cputypes if c in known}
+    return [arch for arch in ArchitectureType if arch in found]
 
 
 def get_arch(filename: Union[str, Path]) -> List[ArchitectureType]:
@@ -1007,16 +1226,17 @@ def get_arch(filename: Union[str, Path]) -> List[ArchitectureType]:
     this_platform = sys.platform
     if this_platform.startswith("win"):
         machine_type = get_shared_library_arch(filename)
-        if machine_type == PEMachineType.I386:
-            return [ArchitectureType.I386]
-        elif machine_type == PEMachineType.AMD64:
-            return [ArchitectureType.X86_64]
-        elif machine_type == PEMachineType.AARCH64:
-            return [ArchitectureType.AARCH64]
-        else:
-            return []
+        if machine_type in _PE_ARCHITECTURES:
+            return [_PE_ARCHITECTURES[machine_type]]
+        return []
     elif this_platform not in ("linux", "darwin"):
         raise OSError("Unsupported platform: %s" % this_platform)
+
+    binary_archs = get_binary_arch(filename)
+    if binary_archs is not None:
+        return binary_archs
+
+    # Let file identify binaries we cannot read or whose format is unknown
     res = subprocess.run(["file", filename], capture_output=True)
     out = res.stdout.decode("ascii")
 